@@ -1,3 +1,6 @@
+import aiohttp
+import asyncio
+
 from api.endpoints import PLAYLIST_TRACKS_ENDPOINT
 from api.spotify_api import SpotifyAPI
 from api.track import Track
@@ -8,15 +11,21 @@ class Playlist:
         self.spotify_api = spotify_api
         self.playlist_id = playlist_id
 
-    def get_tracks(self):
-        """Yield tracks from the playlist."""
+    async def get_tracks(self, session: aiohttp.ClientSession):
+        """Yield tracks from the playlist, prefetching the next page while
+        tracks from the current page are being consumed."""
         limit = 50
         endpoint = f'{PLAYLIST_TRACKS_ENDPOINT.format(playlist_id=self.playlist_id)}?limit={limit}'
+        page_task = asyncio.ensure_future(self.spotify_api.make_request(session, endpoint))
 
-        while endpoint is not None:
-            response = self.spotify_api.make_request(endpoint)
+        while page_task is not None:
+            response = await page_task
 
             endpoint = response.get('next')
+            page_task = (
+                asyncio.ensure_future(self.spotify_api.make_request(session, endpoint))
+                if endpoint is not None else None
+            )
             trackItems = response.get('items')
 
             for trackItem in trackItems:
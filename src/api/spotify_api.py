@@ -1,9 +1,19 @@
+import aiohttp
+import json
+import os
+import time
 from base64 import b64encode
 
 from api.endpoints import TOKEN_URL_ENDPOINT
 from api.utils import Utils
 
 
+# Tokens are valid for an hour; cache them across invocations so repeated
+# runs skip the token POST entirely
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'spotify_album_images', 'token.json')
+TOKEN_EXPIRY_MARGIN = 60  # Seconds of remaining validity required to reuse a token
+
+
 class SpotifyAPI:
     def __init__(self):
         self.client_id = Utils.get_or_ask_env('SPOTIFY_CLIENT_ID')
@@ -11,7 +21,12 @@ class SpotifyAPI:
         self.access_token = None
 
     def authenticate(self):
-        """Authenticate using the Client Credentials Flow and retrieve an access token."""
+        """Authenticate using the Client Credentials Flow, reusing a cached
+        access token when one is still valid."""
+        self.access_token = self.__load_cached_token()
+        if self.access_token is not None:
+            return
+
         response = Utils.post(
             TOKEN_URL_ENDPOINT,
             headers={
@@ -24,15 +39,40 @@ class SpotifyAPI:
         )
         data = response.json()
         self.access_token = data['access_token']
+        self.__store_cached_token(data)
 
-    def make_request(self, endpoint: str):
-        """Make an API request to the Spotify Web API."""
+    async def make_request(self, session: aiohttp.ClientSession, endpoint: str):
+        """Make an asynchronous API request to the Spotify Web API."""
         headers = {'Authorization': f'Bearer {self.access_token}'}
-        response = Utils.get(endpoint, headers=headers)
-        return response.json()
-    
+        return await Utils.get_json(session, endpoint, headers=headers)
+
     def __create_basic_auth_header(self):
         """Create a Basic Auth header for Spotify API requests."""
         auth_string = f'{self.client_id}:{self.client_secret}'
         auth_base64 = b64encode(auth_string.encode('utf-8')).decode('utf-8')
         return f'Basic {auth_base64}'
+
+    @staticmethod
+    def __load_cached_token():
+        """Load the cached access token, or None if missing or near expiry."""
+        try:
+            with open(TOKEN_CACHE_PATH) as f:
+                cached = json.load(f)
+            if time.time() < cached['expires_at'] - TOKEN_EXPIRY_MARGIN:
+                return cached['access_token']
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    @staticmethod
+    def __store_cached_token(data):
+        """Persist the access token with its expiry time, written atomically."""
+        cached = {
+            'access_token': data['access_token'],
+            'expires_at': time.time() + data['expires_in'],
+        }
+        os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+        tmp_path = f'{TOKEN_CACHE_PATH}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, TOKEN_CACHE_PATH)
